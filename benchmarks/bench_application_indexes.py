@@ -0,0 +1,124 @@
+"""Query-time benchmark for the application/job indexes added in migration 1.
+
+Builds a throwaway database with 1M application rows, times the hot lookups without
+any secondary indexes, applies migrations.APPLICATION_INDEXES and times them again.
+
+    python benchmarks/bench_application_indexes.py                 # temporary SQLite file
+    python benchmarks/bench_application_indexes.py --url postgresql://user:pw@host/scratch
+
+Only point --url at a scratch database: the jobs and applications tables are dropped.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from migrations import APPLICATION_INDEXES  # noqa: E402
+
+STATUSES = ['Applied', 'Not Shortlisted', 'Shortlisted', 'Invited', 'Completed', 'Accepted', 'Rejected']
+
+QUERIES = {
+    'shortlist (job_id, status)': "SELECT id FROM applications WHERE job_id = :job_id AND status = 'Applied'",
+    'duplicate check (candidate_id, job_id)': "SELECT id FROM applications WHERE candidate_id = :candidate_id AND job_id = :job_id LIMIT 1",
+    'candidate applications (candidate_id)': "SELECT id FROM applications WHERE candidate_id = :candidate_id",
+    'admin jobs (admin_id)': "SELECT id FROM jobs WHERE admin_id = :admin_id",
+}
+
+def build_schema(engine, args):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS applications"))
+        conn.execute(text("DROP TABLE IF EXISTS jobs"))
+        conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, admin_id INTEGER NOT NULL, title VARCHAR NOT NULL)"))
+        conn.execute(text(
+            "CREATE TABLE applications (id INTEGER PRIMARY KEY, candidate_id INTEGER NOT NULL, "
+            "job_id INTEGER NOT NULL, status VARCHAR NOT NULL)"
+        ))
+        conn.execute(
+            text("INSERT INTO jobs (id, admin_id, title) VALUES (:id, :admin_id, :title)"),
+            [{'id': j, 'admin_id': random.randint(1, args.admins), 'title': f'Job {j}'} for j in range(1, args.jobs + 1)]
+        )
+
+    # Every (candidate, job) pair is distinct so the unique index can be built afterwards.
+    rng = random.Random(42)
+    seen = set()
+    batch, next_id = [], 1
+    started = time.perf_counter()
+    while next_id <= args.rows:
+        pair = (rng.randint(1, args.candidates), rng.randint(1, args.jobs))
+        if pair in seen: continue
+        seen.add(pair)
+        batch.append({'id': next_id, 'candidate_id': pair[0], 'job_id': pair[1], 'status': rng.choice(STATUSES)})
+        next_id += 1
+        if len(batch) == 50000 or next_id > args.rows:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO applications (id, candidate_id, job_id, status) "
+                    "VALUES (:id, :candidate_id, :job_id, :status)"
+                ), batch)
+            batch = []
+    print(f"Loaded {args.rows:,} applications in {time.perf_counter() - started:.1f}s")
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql': conn.execute(text("ANALYZE"))
+
+def time_queries(engine, args):
+    rng = random.Random(7)
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            statement = text(sql)
+            elapsed = 0.0
+            for _ in range(args.repeat):
+                params = {
+                    'job_id': rng.randint(1, args.jobs),
+                    'candidate_id': rng.randint(1, args.candidates),
+                    'admin_id': rng.randint(1, args.admins),
+                }
+                started = time.perf_counter()
+                conn.execute(statement, params).fetchall()
+                elapsed += time.perf_counter() - started
+            results[name] = elapsed / args.repeat * 1000
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='SQLAlchemy URL of a scratch database (default: temporary SQLite file)')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--jobs', type=int, default=5_000)
+    parser.add_argument('--candidates', type=int, default=200_000)
+    parser.add_argument('--admins', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50, help='executions per query per phase')
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not args.url:
+        tmpdir = tempfile.mkdtemp(prefix='bench-indexes-')
+        args.url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    engine = create_engine(args.url)
+
+    build_schema(engine, args)
+    before = time_queries(engine, args)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for statement in APPLICATION_INDEXES: conn.execute(text(statement))
+        if engine.dialect.name == 'postgresql': conn.execute(text("ANALYZE"))
+    print(f"Built indexes in {time.perf_counter() - started:.1f}s")
+    after = time_queries(engine, args)
+
+    print(f"\n{'query':<42}{'no index (ms)':>15}{'indexed (ms)':>15}{'speedup':>10}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<42}{before[name]:>15.3f}{after[name]:>15.3f}{speedup:>9.0f}x")
+
+    if tmpdir:
+        engine.dispose()
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Governor benchmark: interview call latency while a bulk shortlist run competes for quota.
+
+A stand-in for Gemini serves at most --capacity calls at once and answers any call beyond
+that with a 429, as a spent quota does. A shortlist-style batch of --batch calls runs
+with --batch-concurrency threads. Meanwhile interview calls (scoring an answer) arrive
+at --interactive-rate per second. The run is repeated without a governor and with
+llm_governor.Governor sized to the capacity, and once more with a governor configured
+for twice the capacity, which has to back off on 429s. For interview calls it reports
+p50/p95/max latency and failures; for the batch, its wall time and failures.
+
+    python benchmarks/bench_llm_governor.py
+    python benchmarks/bench_llm_governor.py --capacity 4 --batch 400 --batch-concurrency 16 --latency 0.5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import llm_client  # noqa: E402
+import llm_governor  # noqa: E402
+
+SCHEMA = {'type': 'object', 'properties': {'score': {'type': 'integer'}}, 'required': ['score']}
+
+class QuotaExceeded(Exception):
+    code = 429
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+class QuotaLimitedModel:
+    def __init__(self, capacity, latency, seed=3):
+        self.capacity = capacity
+        self.latency = latency
+        self._active = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def generate_content(self, prompt, **kwargs):
+        with self._lock:
+            if self._active >= self.capacity: raise QuotaExceeded('429 Resource has been exhausted (simulated)')
+            self._active += 1
+            delay = self.latency * self._rng.lognormvariate(0, 0.25)
+        try:
+            time.sleep(delay)
+            return Response('{"score": 7}')
+        finally:
+            with self._lock: self._active -= 1
+
+def run(args, governor):
+    model = QuotaLimitedModel(args.capacity, args.latency)
+    client = llm_client.LLMClient(lambda: model, None, 'bench', governor=governor)
+    interactive, interactive_failures, batch_failures = [], [], []
+    stop = threading.Event()
+
+    def batch_call(i):
+        try:
+            client.generate(f'shortlist {i}', SCHEMA, cache=False, priority=llm_governor.BATCH)
+        except Exception as e:
+            batch_failures.append(e)
+
+    def interview_call(i):
+        started = time.perf_counter()
+        try:
+            client.generate(f'score {i}', SCHEMA, cache=False, priority=llm_governor.INTERACTIVE)
+            interactive.append(time.perf_counter() - started)
+        except Exception as e:
+            interactive_failures.append(e)
+
+    def candidates():
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            i = 0
+            while not stop.is_set():
+                pool.submit(interview_call, i)
+                i += 1
+                time.sleep(1 / args.interactive_rate)
+
+    arrivals = threading.Thread(target=candidates)
+    arrivals.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.batch_concurrency) as pool:
+        list(pool.map(batch_call, range(args.batch)))
+    batch_seconds = time.perf_counter() - started
+    stop.set()
+    arrivals.join()
+    return interactive, interactive_failures, batch_seconds, batch_failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--capacity', type=int, default=6, help='concurrent calls the quota allows')
+    parser.add_argument('--latency', type=float, default=0.3, help='median model latency in seconds')
+    parser.add_argument('--batch', type=int, default=200, help='shortlist calls in the bulk run')
+    parser.add_argument('--batch-concurrency', type=int, default=5, help='SHORTLIST_CONCURRENCY')
+    parser.add_argument('--interactive-rate', type=float, default=4, help='interview calls per second')
+    parser.add_argument('--reserved', type=int, default=2, help='slots reserved for interview calls')
+    args = parser.parse_args()
+
+    print(f"capacity {args.capacity}, latency ~{args.latency}s, {args.batch} batch calls x{args.batch_concurrency}, "
+          f"{args.interactive_rate} interview calls/s\n")
+    print(f"{'mode':<12}{'interview p50':>15}{'p95':>9}{'max':>9}{'failed':>9}{'batch wall':>13}{'batch failed':>14}")
+    modes = (
+        ('none', None),
+        ('governor', llm_governor.Governor(max_concurrency=args.capacity, reserved=args.reserved, backoff_base=0.2)),
+        # Configured for twice the real quota: it has to find the limit from 429s
+        ('governor 2x', llm_governor.Governor(max_concurrency=args.capacity * 2, reserved=args.reserved, backoff_base=0.2)),
+    )
+    for label, governor in modes:
+        interactive, failures, batch_seconds, batch_failures = run(args, governor)
+        if interactive:
+            quantiles = statistics.quantiles(interactive, n=100, method='inclusive') if len(interactive) > 1 else interactive * 99
+            p50, p95, worst = quantiles[49] * 1000, quantiles[94] * 1000, max(interactive) * 1000
+        else:
+            p50 = p95 = worst = float('nan')
+        total = len(interactive) + len(failures)
+        print(f"{label:<12}{p50:>12.0f} ms{p95:>6.0f} ms{worst:>6.0f} ms{len(failures):>5}/{total:<3}"
+              f"{batch_seconds:>11.1f} s{len(batch_failures):>10}/{args.batch}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Pre-ranking benchmark: how fast resumes are ranked locally and how many model calls it saves.
+
+Generates a synthetic applicant pool in which a fraction of resumes are written for the
+job and the rest for unrelated roles. It then ranks the pool against the job description
+with prerank.HashingVectorizer, both cold (tokenizing every resume) and warm (vectors
+cached). It reports the ranking time, how many model calls a top-K cut leaves, and how
+many of the relevant resumes survive the cut.
+
+    python benchmarks/bench_prerank.py
+    python benchmarks/bench_prerank.py --applicants 20000 --relevant 0.05 --top-k 200 --call-seconds 2
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import prerank  # noqa: E402
+
+JOB = """Senior Python Backend Engineer. Build and operate Flask and SQLAlchemy services on
+PostgreSQL, design REST APIs, write pytest suites, deploy with Docker on AWS, and tune
+query performance. Experience with Redis, Celery and CI pipelines is a plus."""
+
+ROLES = {
+    'relevant': 'python flask sqlalchemy postgresql rest api pytest docker aws redis celery backend ci',
+    'frontend': 'javascript react typescript css html figma webpack redux accessibility design',
+    'sales': 'sales crm quota pipeline negotiation salesforce prospecting accounts revenue clients',
+    'nursing': 'patient care nursing clinical icu medication charting triage hospital bls',
+    'finance': 'accounting excel audit ledger reconciliation gaap tax budgeting forecasting reports',
+}
+FILLER = 'team project delivered managed improved collaborated stakeholders responsible years experience led'.split()
+
+def make_resume(rng, role):
+    words = ROLES[role].split()
+    body = rng.choices(words, k=rng.randint(40, 120)) + rng.choices(FILLER, k=rng.randint(80, 200))
+    rng.shuffle(body)
+    return f'Candidate resume. Role: {role}. ' + ' '.join(body)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applicants', type=int, default=5000)
+    parser.add_argument('--relevant', type=float, default=0.1, help='fraction of resumes written for the job')
+    parser.add_argument('--top-k', type=int, default=100)
+    parser.add_argument('--call-seconds', type=float, default=1.5, help='assumed latency of one model call')
+    parser.add_argument('--concurrency', type=int, default=8, help='model calls in flight (SHORTLIST_CONCURRENCY)')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    others = [role for role in ROLES if role != 'relevant']
+    roles = ['relevant' if rng.random() < args.relevant else rng.choice(others) for _ in range(args.applicants)]
+    resumes = [make_resume(rng, role) for role in roles]
+
+    vectorizer = prerank.HashingVectorizer()
+    timings = {}
+    for label in ('cold', 'warm'):
+        started = time.perf_counter()
+        scores = vectorizer.similarities(JOB, resumes)
+        keep = prerank.select(scores, top_k=args.top_k)
+        timings[label] = time.perf_counter() - started
+
+    relevant = sum(1 for role in roles if role == 'relevant')
+    kept_relevant = sum(1 for role, kept in zip(roles, keep) if kept and role == 'relevant')
+    sent = int(keep.sum())
+    before = args.applicants * args.call_seconds / args.concurrency
+    after = sent * args.call_seconds / args.concurrency + timings['cold']
+
+    print(f"{args.applicants} applicants, {relevant} written for the job, top-K = {args.top_k}\n")
+    print(f"rank cold (tokenize + score)   {timings['cold'] * 1000:9.1f} ms")
+    print(f"rank warm (cached vectors)     {timings['warm'] * 1000:9.1f} ms")
+    print(f"model calls                    {args.applicants:>6} -> {sent}")
+    print(f"relevant resumes kept          {kept_relevant}/{min(relevant, args.top_k)} possible")
+    print(f"estimated shortlist wall time  {before:7.1f} s -> {after:.1f} s "
+          f"({args.call_seconds}s per call, {args.concurrency} in flight)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Concurrent download benchmark for the report storage backends.
+
+Starts a threaded HTTP server with one route per backend (plus the old
+`Response(open(...))` route for comparison) and downloads the same report from many
+client threads at once. Reports requests/s, throughput and latency percentiles for
+full downloads, and checks Range and conditional requests on every backend.
+
+    python benchmarks/bench_report_downloads.py
+    python benchmarks/bench_report_downloads.py --size-kb 2048 --concurrency 32 --requests 2000
+"""
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, Response
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, MetaData, String, Table, create_engine
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import report_storage  # noqa: E402
+
+KEY = report_storage.report_key(1)
+
+def build_app(workdir, payload):
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'reports.db')}")
+    table = Table(
+        'report_blobs', MetaData(),
+        Column('key', String(255), primary_key=True), Column('content', LargeBinary, nullable=False),
+        Column('size', Integer, nullable=False), Column('etag', String(64), nullable=False),
+        Column('created_at', DateTime, nullable=False),
+    )
+    table.metadata.create_all(engine)
+    backends = {
+        'local': report_storage.LocalReportStorage(os.path.join(workdir, 'reports')),
+        'database': report_storage.DatabaseReportStorage(lambda: engine, table),
+    }
+    for storage in backends.values():
+        path = storage.staging_path(KEY)
+        with open(path, 'wb') as f: f.write(payload)
+        storage.save(KEY, path)
+
+    app = Flask(__name__)
+
+    @app.route('/legacy')
+    def legacy():
+        return Response(open(backends['local'].path(KEY), 'rb'), mimetype='application/pdf')
+
+    @app.route('/<name>')
+    def download(name):
+        return report_storage.send_report(backends[name], KEY, KEY)
+
+    return app
+
+def fetch(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        body = response.read()
+    return time.perf_counter() - started, len(body)
+
+def run(url, total, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: fetch(url), range(total)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(r[0] * 1000 for r in results)
+    return {
+        'rps': total / elapsed,
+        'mbps': sum(r[1] for r in results) / elapsed / 1e6,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+def check_protocol(base, name, size):
+    with urllib.request.urlopen(f'{base}/{name}') as response:
+        etag = response.headers['ETag']
+    with urllib.request.urlopen(urllib.request.Request(f'{base}/{name}', headers={'Range': 'bytes=0-1023'})) as response:
+        assert response.status == 206 and len(response.read()) == min(1024, size)
+    try:
+        urllib.request.urlopen(urllib.request.Request(f'{base}/{name}', headers={'If-None-Match': etag}))
+        raise AssertionError('expected 304')
+    except urllib.error.HTTPError as e:
+        assert e.code == 304
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-kb', type=int, default=512, help='size of the stored report')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    workdir = tempfile.mkdtemp(prefix='bench-downloads-')
+    server = None
+    try:
+        payload = os.urandom(args.size_kb * 1024)
+        server = make_server('127.0.0.1', 0, build_app(workdir, payload), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+
+        print(f"{args.requests} downloads of {args.size_kb} KB, {args.concurrency} concurrent clients\n")
+        print(f"{'route':<12}{'req/s':>10}{'MB/s':>10}{'p50 (ms)':>11}{'p95 (ms)':>11}  range/304")
+        for name in ('legacy', 'local', 'database'):
+            fetch(f'{base}/{name}')
+            stats = run(f'{base}/{name}', args.requests, args.concurrency)
+            protocol = '-'
+            if name != 'legacy':
+                check_protocol(base, name, len(payload))
+                protocol = 'ok'
+            print(f"{name:<12}{stats['rps']:>10.1f}{stats['mbps']:>10.1f}{stats['p50']:>11.1f}{stats['p95']:>11.1f}  {protocol}")
+    finally:
+        if server: server.shutdown()
+        shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Throughput benchmark for final-report PDF rendering.
+
+Compares the old inline path against report_rendering. The old path rebuilt the
+stylesheet on every call, rendered into a BytesIO and copied it to disk. The new path
+uses the cached stylesheet and writes directly to the file. It then measures the
+process pool at 1..N workers and reports throughput per core.
+
+    python benchmarks/bench_report_rendering.py
+    python benchmarks/bench_report_rendering.py --reports 400 --workers 4
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import report_rendering  # noqa: E402
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.platypus import SimpleDocTemplate  # noqa: E402
+
+SCORECARD = {
+    'overall_summary': 'The candidate communicated clearly and showed solid practical experience. ' * 6,
+    'strengths': [f'Strength {i}: explained trade-offs with concrete examples from past projects.' for i in range(5)],
+    'areas_for_improvement': [f'Area {i}: could go deeper on testing and failure modes.' for i in range(4)],
+    'final_recommendation': 'Hire',
+}
+FLAGS = ['Tab switched (1)', 'Tab switched (2)', 'Multiple faces detected']
+
+def render_legacy(path):
+    """The pre-refactor path from generate_final_report."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, **report_rendering.PAGE_MARGINS)
+    report_rendering._styles = report_rendering._build_styles()
+    doc.build(report_rendering.build_story(SCORECARD, FLAGS))
+    with open(path, 'wb') as f: f.write(buffer.getvalue())
+
+def render_cached(path):
+    report_rendering.render_report(SCORECARD, FLAGS, path)
+
+def time_serial(fn, count, workdir):
+    started = time.perf_counter()
+    for i in range(count): fn(os.path.join(workdir, f'serial_{i}.pdf'))
+    return count / (time.perf_counter() - started)
+
+def time_pool(workers, count, workdir):
+    pool = report_rendering.get_pool(workers)
+    # Warm every worker so process start-up is not counted
+    list(pool.map(report_rendering.render_report, [SCORECARD] * workers, [FLAGS] * workers,
+                  [os.path.join(workdir, f'warm_{i}.pdf') for i in range(workers)]))
+    started = time.perf_counter()
+    futures = [pool.submit(report_rendering.render_report, SCORECARD, FLAGS, os.path.join(workdir, f'pool_{i}.pdf'))
+               for i in range(count)]
+    for future in futures: future.result()
+    elapsed = time.perf_counter() - started
+    report_rendering.reset_pool()
+    return count / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=200, help='reports rendered per measurement')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1), help='largest pool size to measure')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-reports-')
+    try:
+        render_cached(os.path.join(workdir, 'warmup.pdf'))
+        legacy = time_serial(render_legacy, args.reports, workdir)
+        report_rendering._styles = report_rendering._build_styles()
+        cached = time_serial(render_cached, args.reports, workdir)
+        print(f"{'mode':<34}{'reports/s':>12}{'reports/s/core':>16}")
+        print(f"{'inline, stylesheet per call':<34}{legacy:>12.1f}{legacy:>16.1f}")
+        print(f"{'inline, cached stylesheet':<34}{cached:>12.1f}{cached:>16.1f}")
+        for workers in sorted({1, 2, args.workers}):
+            if workers > args.workers: continue
+            rate = time_pool(workers, args.reports, workdir)
+            print(f"{f'process pool, {workers} worker(s)':<34}{rate:>12.1f}{rate / workers:>16.1f}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == '__main__':
+    main()
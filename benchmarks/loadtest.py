@@ -0,0 +1,408 @@
+"""End-to-end load test of app.py against a local database and a deterministic Gemini stand-in.
+
+The app is imported with GEMINI_API_KEY unset, and its `model` is replaced by FakeModel.
+FakeModel answers every prompt the app sends, after a configurable latency. It fails at a
+configurable rate (raising as a 503 would) and returns truncated JSON at another rate,
+so retries and repairs show up in the numbers. The app runs in a threaded HTTP server
+(or, with --gunicorn, under gunicorn with gunicorn.conf.py), and virtual users drive it
+over real HTTP with their own cookies, in four phases:
+
+    apply      candidates register, log in, browse jobs, open one and apply
+    shortlist  the admin runs AI shortlisting and waits for the background task
+    interview  shortlisted candidates are invited, start the interview, answer and get
+               each answer scored, send proctoring events and submit
+    report     the final report tasks finish and the admin downloads each report
+
+For every endpoint it prints request count, errors, throughput and p50/p95/p99 latency,
+plus the time background tasks took. Use --json to save a run and --compare to fail
+(exit status 1) when any endpoint's p95 got more than --max-regression slower.
+
+    python benchmarks/loadtest.py
+    python benchmarks/loadtest.py --candidates 200 --concurrency 16 --llm-latency 0.8 --llm-failure-rate 0.05
+    python benchmarks/loadtest.py --json before.json  # then, after a change:
+    python benchmarks/loadtest.py --compare before.json
+    python benchmarks/loadtest.py --url postgresql://user:pw@localhost/scratch
+    python benchmarks/loadtest.py --gunicorn --workers 2 --threads 16 --llm-latency 1.5 --concurrency 32
+    python benchmarks/loadtest.py --gunicorn --workers 2 --threads 1 --worker-class sync --llm-latency 1.5 --concurrency 32
+
+Only point --url at a scratch database; the run creates tables and rows in it.
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+JOB_DESCRIPTION = """Backend Engineer. Build Flask and SQLAlchemy services on PostgreSQL, design
+REST APIs, write pytest suites and deploy with Docker. Redis and Celery are a plus."""
+MATCHING_SKILLS = 'python flask sqlalchemy postgresql rest api pytest docker redis celery'.split()
+OTHER_SKILLS = 'sales negotiation crm excel accounting nursing cooking retail logistics'.split()
+
+
+# --- Gemini stand-in ---
+class FakeModelError(Exception):
+    """Raised like a 503 from the API."""
+
+class FakeUsage:
+    def __init__(self, prompt, text):
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+class FakeResponse:
+    def __init__(self, prompt, text):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt, text)
+
+    def __iter__(self):
+        for start in range(0, len(self.text), 24):
+            yield FakeChunk(self.text[start:start + 24])
+
+class FakeModel:
+    """Answers the app's prompts with fixed, well-formed JSON, sleeping a lognormal
+    latency around `latency` seconds first. The random stream is seeded, so two runs with
+    the same arguments see the same failures in the same order."""
+
+    def __init__(self, latency, failure_rate, malformed_rate, seed):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = self.failures = self.malformed = 0
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._rng.lognormvariate(0, 0.35) if self.latency else 0
+            fail = self._rng.random() < self.failure_rate
+            malformed = self._rng.random() < self.malformed_rate
+        time.sleep(delay)
+        if fail:
+            with self._lock: self.failures += 1
+            raise FakeModelError('503 Service Unavailable (simulated)')
+        text = json.dumps(self.answer(prompt))
+        if malformed:
+            with self._lock: self.malformed += 1
+            text = text[:-1]
+        return FakeResponse(prompt, text)
+
+    @staticmethod
+    def answer(prompt):
+        if 'Your previous reply could not be used' in prompt:
+            prompt = prompt.split('Your previous reply could not be used')[0]
+        if '"scores"' in prompt:
+            count = prompt.count('--- Question ')
+            return {'scores': [{'index': i, 'score': 7, 'feedback': 'Clear and relevant.'} for i in range(count)],
+                    'overall_summary': 'Solid interview.', 'strengths': ['Communication'],
+                    'areas_for_improvement': ['Depth'], 'final_recommendation': 'Hire'}
+        if '"results"' in prompt:
+            blocks = prompt.split('--- Candidate ')[1:]
+            return {'results': [{'application_id': int(b.split(' ', 1)[0]),
+                                 'shortlisted': 'python' in b.lower(), 'reason': 'Skills match.'} for b in blocks]}
+        if '"casual_questions"' in prompt:
+            questions = json.loads(prompt.split('keeping their order: ', 1)[1].split('.\n', 1)[0])
+            return {'casual_questions': [f'So, {q[0].lower()}{q[1:]}' for q in questions]}
+        if '"casual_question"' in prompt:
+            return {'casual_question': 'So, tell me about that.'}
+        if '"questions"' in prompt:
+            return {'questions': [f'Question {i + 1} about the role?' for i in range(5)]}
+        if 'scorecard' in prompt:
+            return {'overall_summary': 'Solid interview.', 'strengths': ['Communication'],
+                    'areas_for_improvement': ['Depth'], 'final_recommendation': 'Hire'}
+        if '"score"' in prompt:
+            return {'score': 7, 'feedback': 'Clear and relevant answer.'}
+        resume = prompt.split('**Candidate Resume:**', 1)[-1].lower()
+        return {'shortlisted': 'python' in resume, 'reason': 'Skills match.'}
+
+
+def gunicorn_app():
+    """App factory for --gunicorn runs: app.py with FakeModel in place of Gemini."""
+    import app as application
+    application.model = FakeModel(*json.loads(os.environ['LOADTEST_FAKE_MODEL']))
+    return application.create_app()
+
+
+# --- HTTP client and latency recording ---
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.phase_seconds = {}
+        self.task_seconds = defaultdict(list)
+
+    def record(self, label, seconds, ok):
+        with self._lock:
+            self.latencies[label].append(seconds)
+            if not ok: self.errors[label] += 1
+
+class User:
+    """One browser: its own cookie jar, so sessions behave as they do in production."""
+
+    def __init__(self, base, recorder):
+        self.base = base
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def call(self, method, path, label, body=None, expect=(200, 202)):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'} if data else {})
+        started = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=120) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        self.recorder.record(label, time.perf_counter() - started, status in expect)
+        if status not in expect: raise RuntimeError(f'{method} {path} -> {status}: {payload[:200]!r}')
+        return json.loads(payload) if payload[:1] in (b'{', b'[') else payload
+
+    def wait_for_task(self, task_id, kind, poll=0.1):
+        started = time.perf_counter()
+        while True:
+            task = self.call('GET', f'/api/tasks/{task_id}', 'GET /api/tasks/<id>')
+            if task['status'] in ('succeeded', 'failed'): break
+            time.sleep(poll)
+        self.recorder.task_seconds[kind].append(time.perf_counter() - started)
+        if task['status'] == 'failed': raise RuntimeError(f'{kind} task failed: {task["error"]}')
+        return task['result']
+
+
+# --- Flows ---
+def apply_flow(base, recorder, index, job_id, rng_seed):
+    rng = random.Random(rng_seed)
+    user = User(base, recorder)
+    email = f'candidate{index}@loadtest.local'
+    user.call('POST', '/api/register/candidate', 'POST /api/register/candidate',
+              {'name': f'Candidate {index}', 'email': email, 'password': 'loadtest'})
+    user.call('POST', '/api/login/candidate', 'POST /api/login/candidate', {'email': email, 'password': 'loadtest'})
+    user.call('GET', '/api/jobs', 'GET /api/jobs')
+    user.call('GET', f'/api/jobs/{job_id}', 'GET /api/jobs/<id>')
+    skills = MATCHING_SKILLS if rng.random() < 0.5 else OTHER_SKILLS
+    resume = f'Candidate {index}. Skills: ' + ', '.join(rng.sample(skills, 5)) + '. ' + 'Experienced professional. ' * 40
+    user.call('POST', f'/api/apply/{job_id}', 'POST /api/apply/<id>', {'resume_text': resume})
+    applications = user.call('GET', '/api/candidate/applications', 'GET /api/candidate/applications')
+    return user, applications[0]['id']
+
+def interview_flow(user, admin, application_id):
+    admin.call('POST', f'/api/admin/send_invite/{application_id}', 'POST /api/admin/send_invite/<id>')
+    started = user.call('POST', '/api/start_interview', 'POST /api/start_interview', {'application_id': application_id})
+    if 'task_id' in started:
+        questions = user.wait_for_task(started['task_id'], 'generate_questions')['questions']
+    else:
+        questions = started['questions']
+    results = []
+    for question in questions:
+        answer = f'For application {application_id}, my answer to "{question}" draws on several projects. ' * 3
+        scored = user.call('POST', '/api/score_answer', 'POST /api/score_answer', {'question': question, 'answer': answer})
+        results.append({'question': question, 'answer': answer, 'score': scored.get('score', 0),
+                        'feedback': scored.get('feedback', '')})
+        user.call('POST', '/api/proctor/events', 'POST /api/proctor/events', {'events': [
+            {'type': 'multiple_faces', 'at': int(time.time() * 1000)}, {'type': 'lack_of_focus', 'at': int(time.time() * 1000)}
+        ]})
+    submitted = user.call('POST', '/api/generate_final_report', 'POST /api/generate_final_report',
+                          {'interview_results': results, 'proctoring_flags': []})
+    return submitted['task_id']
+
+def report_flow(admin, application_id, poll=0.1):
+    """Submitting the interview ends the candidate's session, so the admin waits for the PDF."""
+    started = time.perf_counter()
+    while True:
+        report = admin.call('GET', f'/api/download_report/{application_id}', 'GET /api/download_report/<id>',
+                            expect=(200, 404))
+        if report[:4] == b'%PDF': break
+        if time.perf_counter() - started > 120: raise RuntimeError(f'no report for application {application_id}')
+        time.sleep(poll)
+    admin.recorder.task_seconds['final_report'].append(time.perf_counter() - started)
+
+
+def run_phase(recorder, name, fn, items, concurrency):
+    started = time.perf_counter()
+    results, failures = [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(fn, item) for item in items]:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failures += 1
+                if failures <= 3: print(f'  {name}: {e}')
+    recorder.phase_seconds[name] = time.perf_counter() - started
+    if failures: print(f'  {name}: {failures} of {len(items)} flows failed')
+    return results
+
+def percentile(values, pct):
+    if len(values) == 1: return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+def summarize(recorder):
+    rows = {}
+    for label, values in sorted(recorder.latencies.items()):
+        rows[label] = {
+            'count': len(values), 'errors': recorder.errors.get(label, 0),
+            'p50_ms': percentile(values, 50) * 1000, 'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000, 'mean_ms': statistics.fmean(values) * 1000,
+        }
+    return rows
+
+def print_report(rows, recorder, fake, wall):
+    print(f"\n{'endpoint':<38}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, row in rows.items():
+        print(f"{label:<38}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+    print('\nphases: ' + ', '.join(f'{name} {seconds:.1f}s' for name, seconds in recorder.phase_seconds.items()))
+    total = sum(row['count'] for row in rows.values())
+    print(f'throughput: {total} requests in {wall:.1f}s = {total / wall:.1f} req/s')
+    for kind, values in recorder.task_seconds.items():
+        print(f'task {kind}: n={len(values)} p50 {percentile(values, 50):.2f}s p95 {percentile(values, 95):.2f}s')
+    if fake: print(f'model: {fake.calls} calls, {fake.failures} simulated failures, {fake.malformed} malformed')
+
+def compare(rows, baseline_path, max_regression):
+    with open(baseline_path) as f: baseline = json.load(f)['endpoints']
+    regressed = []
+    print(f"\n{'endpoint':<38}{'p95 before':>12}{'p95 now':>10}{'change':>9}")
+    for label, row in rows.items():
+        if label not in baseline: continue
+        before = baseline[label]['p95_ms']
+        change = (row['p95_ms'] - before) / before if before else 0.0
+        print(f"{label:<38}{before:>12.1f}{row['p95_ms']:>10.1f}{change:>+9.0%}")
+        if change > max_regression: regressed.append(label)
+    if regressed: print(f'\np95 regressed more than {max_regression:.0%}: {", ".join(regressed)}')
+    return not regressed
+
+def start_gunicorn(args):
+    """Serve the app under gunicorn with the repo's gunicorn.conf.py; returns (base URL, stop)."""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    env = dict(os.environ, LOADTEST_FAKE_MODEL=json.dumps(
+        [args.llm_latency, args.llm_failure_rate, args.llm_malformed_rate, args.seed]))
+    if args.workers: env['WEB_CONCURRENCY'] = str(args.workers)
+    if args.threads: env['WEB_THREADS'] = str(args.threads)
+    command = [sys.executable, '-m', 'gunicorn', '--config', os.path.join(ROOT, 'gunicorn.conf.py'),
+               '--pythonpath', f'{ROOT},{HERE}', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    if args.worker_class: command += ['--worker-class', args.worker_class]
+    process = subprocess.Popen(command + ['loadtest:gunicorn_app()'], env=env)
+    base = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            with urllib.request.urlopen(base + '/health', timeout=5): break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError('gunicorn did not start')
+            time.sleep(0.2)
+
+    def stop():
+        process.terminate()
+        process.wait(timeout=90)
+    return base, stop
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8, help='virtual users running at once')
+    parser.add_argument('--llm-latency', type=float, default=0.3, help='median fake model latency in seconds')
+    parser.add_argument('--llm-failure-rate', type=float, default=0.0)
+    parser.add_argument('--llm-malformed-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--url', help='database URL (default: a temporary SQLite file)')
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results file from an earlier run to compare p95 against')
+    parser.add_argument('--max-regression', type=float, default=0.25, help='allowed p95 increase with --compare')
+    parser.add_argument('--gunicorn', action='store_true', help='serve with gunicorn and gunicorn.conf.py')
+    parser.add_argument('--workers', type=int, help='gunicorn worker processes (WEB_CONCURRENCY)')
+    parser.add_argument('--threads', type=int, help='gunicorn threads per worker (WEB_THREADS)')
+    parser.add_argument('--worker-class', help='override the gunicorn worker class, e.g. sync')
+    args = parser.parse_args()
+
+    def resolve(path): return os.path.abspath(path) if path else None
+    args.json, args.compare = resolve(args.json), resolve(args.compare)
+    workdir = tempfile.mkdtemp(prefix='loadtest-')
+    os.chdir(workdir)  # reports/ is created relative to the working directory
+    os.environ['DATABASE_URL'] = args.url or f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    os.environ.pop('GEMINI_API_KEY', None)
+    os.environ.setdefault('EMAIL_BACKEND', 'local')
+    os.environ.setdefault('LOG_LEVEL', 'ERROR')
+    os.environ.setdefault('TASK_POLL_INTERVAL', '0.05')
+    sys.path.insert(0, ROOT)
+    import app as application  # noqa: E402 -- configuration above must be in place first
+    from werkzeug.serving import make_server
+
+    flask_app = application.create_app()
+    with flask_app.app_context():
+        application.init_db(retries=1)
+    if args.gunicorn:
+        fake = None  # lives in the gunicorn workers
+        base, stop_server = start_gunicorn(args)
+    else:
+        fake = FakeModel(args.llm_latency, args.llm_failure_rate, args.llm_malformed_rate, args.seed)
+        application.model = fake
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, flask_app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base, stop_server = f'http://127.0.0.1:{server.server_port}', server.shutdown
+    recorder = Recorder()
+
+    try:
+        admin = User(base, recorder)
+        admin.call('POST', '/api/register/admin', 'POST /api/register/admin',
+                   {'company_name': 'Loadtest Inc', 'email': 'admin@loadtest.local', 'phone': '0', 'password': 'loadtest'})
+        admin.call('POST', '/api/login/admin', 'POST /api/login/admin', {'email': 'admin@loadtest.local', 'password': 'loadtest'})
+        job_id = admin.call('POST', '/api/admin/create_job', 'POST /api/admin/create_job',
+                            {'title': 'Backend Engineer', 'description': JOB_DESCRIPTION})['job_id']
+        print(f'{args.candidates} candidates, {args.concurrency} concurrent users, model latency ~{args.llm_latency}s, '
+              f"database {os.environ['DATABASE_URL'].split(':', 1)[0]}, "
+              + (f"gunicorn {args.worker_class or 'gthread'} (workers {args.workers or 'default'}, threads {args.threads or 'default'})"
+                 if args.gunicorn else 'in-process server'))
+
+        started = time.perf_counter()
+        applied = run_phase(recorder, 'apply', lambda i: apply_flow(base, recorder, i, job_id, args.seed * 100000 + i),
+                            range(args.candidates), args.concurrency)
+        users = {application_id: user for user, application_id in applied}
+
+        def shortlist(_):
+            task = admin.call('POST', f'/api/admin/shortlist/{job_id}', 'POST /api/admin/shortlist/<id>')
+            return admin.wait_for_task(task['task_id'], 'shortlist', poll=0.2)
+        run_phase(recorder, 'shortlist', shortlist, [None], 1)
+        detail = admin.call('GET', f'/api/admin/jobs/{job_id}?status=Shortlisted', 'GET /api/admin/jobs/<id>')
+        shortlisted = [a['id'] for a in detail['applications'] if a['id'] in users]
+
+        submitted = run_phase(recorder, 'interview', lambda a: (a, interview_flow(users[a], admin, a)),
+                              shortlisted, args.concurrency)
+        run_phase(recorder, 'report', lambda item: report_flow(admin, item[0]), submitted, args.concurrency)
+        wall = time.perf_counter() - started
+
+        rows = summarize(recorder)
+        print_report(rows, recorder, fake, wall)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump({'args': vars(args), 'endpoints': rows, 'phases': recorder.phase_seconds}, f, indent=2)
+        if args.compare:
+            if not compare(rows, args.compare, args.max_regression): sys.exit(1)
+    finally:
+        stop_server()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
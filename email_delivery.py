@@ -0,0 +1,77 @@
+"""Email sender backends used by the outbox worker in app.py.
+
+Every backend implements send_batch(messages), where each message is an OutboxMessage.
+It either delivers the whole batch or raises, and the outbox retries the batch later
+with backoff. LocalSender is an in-process stand-in for development and tests.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+OutboxMessage = namedtuple('OutboxMessage', ['id', 'to', 'subject', 'html'])
+
+class ResendSender:
+    name = 'resend'
+    max_batch_size = 100   # Resend batch endpoint limit
+
+    def __init__(self, api_key, sender):
+        import resend
+        resend.api_key = api_key
+        self._resend = resend
+        self.sender = sender
+
+    def send_batch(self, messages):
+        params = [{'from': self.sender, 'to': [m.to], 'subject': m.subject, 'html': m.html} for m in messages]
+        if len(params) == 1:
+            self._resend.Emails.send(params[0])
+        else:
+            self._resend.Batch.send(params)
+
+class LocalSender:
+    """Records messages in memory instead of sending them. `fail_next` makes the next N
+    batches raise, which exercises the retry path.
+    """
+    name = 'local'
+    max_batch_size = 100
+
+    def __init__(self, sender='noreply@example.com'):
+        self.sender = sender
+        self.sent = []
+        self.batches = 0
+        self.fail_next = 0
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages):
+        with self._lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise RuntimeError('LocalSender simulated failure')
+            self.batches += 1
+            self.sent.extend(messages)
+        for m in messages:
+            logger.info('[local email] to=%s subject=%r', m.to, m.subject)
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,39 @@
+"""Gunicorn settings, read automatically when gunicorn starts in this directory:
+
+    gunicorn "app:create_app()"
+
+Most interview requests spend their time waiting on Gemini or the database, not on the
+CPU, so each worker process serves requests from a pool of threads (gthread). A waiting
+request then holds one thread instead of a whole process. With sync workers, a few
+candidates waiting on the model would block every other request.
+
+WEB_CONCURRENCY sets the number of processes (one per CPU core is plenty), and WEB_THREADS
+sets the threads per process. app.py sizes each process's database pool from WEB_THREADS.
+Set the environment variables rather than the command-line flags, so the app sees the
+same numbers as gunicorn.
+"""
+import os
+import threading
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('WEB_THREADS', '16'))
+os.environ['WEB_THREADS'] = str(threads)  # read by app.py when sizing the connection pool
+
+# Load and configure the app once in the master; workers fork from it and start quickly.
+# Nothing connects or starts threads during create_app(), so forking afterwards is safe.
+preload_app = True
+
+# gthread workers heartbeat from their main loop, so a request waiting on the model does
+# not count against `timeout`; it only catches a worker that has hung.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 60   # let in-flight model calls finish on deploy
+keepalive = 5
+
+def post_worker_init(worker):
+    # Import the Gemini SDK (about a second) in the background, so the first request
+    # that needs the model does not wait for it. Done after the fork, so no gRPC state
+    # is shared with the master.
+    import app
+    threading.Thread(target=app.get_model, name='gemini-warmup', daemon=True).start()
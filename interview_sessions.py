@@ -0,0 +1,138 @@
+"""Server-side state for in-progress interviews.
+
+The browser only holds a short random id in its signed cookie. The interview context
+(application, job, proctoring counters and flags) lives in a store, so cookie size and
+per-request signing cost stay constant however long the job description is or however
+many proctoring events pile up.
+
+State is a small JSON-serializable dict. Each save pushes expiry `ttl` seconds ahead,
+so abandoned interviews expire and are evicted, while active ones are kept. Requests
+that change part of the state while others may be in flight (answers saved without
+waiting for the previous save) use modify(), which applies a change atomically instead
+of overwriting the whole dict with a stale copy.
+MemorySessionStore is the single-process stand-in for development. With more than one
+worker process use DatabaseSessionStore, because every worker must see the same state.
+"""
+import json
+import random
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, update
+
+from ttl_cache import TTLCache
+
+def new_session_id():
+    return secrets.token_urlsafe(16)
+
+
+class MemorySessionStore:
+    name = 'memory'
+
+    def __init__(self, max_entries=10000):
+        self._entries = TTLCache(max_entries)  # sid -> JSON text
+
+    @property
+    def evictions(self):
+        return self._entries.evictions
+
+    def get(self, sid):
+        state = self._entries.get(sid)
+        return json.loads(state) if state is not None else None
+
+    def save(self, sid, state, ttl):
+        self._entries.set(sid, json.dumps(state), ttl)
+
+    def modify(self, sid, mutate, ttl):
+        """Apply `mutate(state)` in place and save, atomically. Returns the new state, or
+        None if the session has expired."""
+        def apply(text):
+            state = json.loads(text)
+            mutate(state)
+            return json.dumps(state)
+        text = self._entries.modify(sid, apply, ttl)
+        return json.loads(text) if text is not None else None
+
+    def delete(self, sid):
+        self._entries.pop(sid)
+
+    def evict(self):
+        return self._entries.purge_expired()
+
+
+class DatabaseSessionStore:
+    """Sessions in `table` (see InterviewSession in app.py), shared by all workers.
+
+    Uses its own short transactions so saving state never commits the caller's session.
+    Expired rows are removed every `evict_every` saves. Every write bumps the row's
+    `version`; modify() writes only if the version is still the one it read, and
+    otherwise reads again and retries.
+    """
+    name = 'database'
+
+    def __init__(self, engine_getter, table, evict_every=200, max_conflicts=20):
+        self._engine_getter = engine_getter
+        self.table = table
+        self.evict_every = evict_every
+        self.max_conflicts = max_conflicts
+        self._saves = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, sid):
+        t = self.table
+        with self._engine_getter().connect() as conn:
+            state = conn.execute(
+                select(t.c.state).where(t.c.id == sid, t.c.expires_at > datetime.utcnow())
+            ).scalar()
+        return json.loads(state) if state is not None else None
+
+    def save(self, sid, state, ttl):
+        t = self.table
+        now = datetime.utcnow()
+        values = {'state': json.dumps(state), 'expires_at': now + timedelta(seconds=ttl), 'updated_at': now}
+        with self._engine_getter().begin() as conn:
+            if not conn.execute(update(t).where(t.c.id == sid).values(version=t.c.version + 1, **values)).rowcount:
+                conn.execute(insert(t).values(id=sid, application_id=state.get('application_id'), **values))
+        self._saved()
+
+    def _saved(self):
+        with self._lock:
+            self._saves += 1
+            due = self._saves % self.evict_every == 0
+        if due: self.evict()
+
+    def modify(self, sid, mutate, ttl):
+        """Apply `mutate(state)` in place and save it, retrying if another request saved
+        in between. Returns the new state, or None if the session has expired."""
+        t = self.table
+        for attempt in range(self.max_conflicts):
+            if attempt: time.sleep(random.uniform(0, 0.005 * attempt))  # let the other writer finish
+            with self._engine_getter().begin() as conn:
+                row = conn.execute(
+                    select(t.c.state, t.c.version).where(t.c.id == sid, t.c.expires_at > datetime.utcnow())
+                ).first()
+                if row is None: return None
+                state = json.loads(row.state)
+                mutate(state)
+                now = datetime.utcnow()
+                written = conn.execute(update(t).where(t.c.id == sid, t.c.version == row.version).values(
+                    state=json.dumps(state), expires_at=now + timedelta(seconds=ttl), updated_at=now,
+                    version=row.version + 1
+                )).rowcount
+            if written:
+                self._saved()
+                return state
+        raise RuntimeError(f'interview session {sid} kept changing; gave up after {self.max_conflicts} attempts')
+
+    def delete(self, sid):
+        with self._engine_getter().begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.id == sid))
+
+    def evict(self):
+        with self._engine_getter().begin() as conn:
+            removed = conn.execute(delete(self.table).where(self.table.c.expires_at <= datetime.utcnow())).rowcount or 0
+        self.evictions += removed
+        return removed
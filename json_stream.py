@@ -0,0 +1,148 @@
+"""Incremental parser for a JSON object that arrives in chunks from a streaming model call.
+
+The model answers with a single JSON object, sometimes wrapped in ``` fences. Waiting
+for the complete text before calling json.loads() means the UI shows nothing until the
+last token arrives. `JSONObjectStream.feed()` takes each chunk as it comes and returns
+what became known with it:
+
+    ('partial', key, text)          a top-level string value still being written (so far)
+    ('item', key, index, value)     an element of a top-level array has completed
+    ('field', key, value)           a top-level value has completed
+
+Only the top level is tracked; nested values are reported whole once they close.
+`close()` parses the full text with json.loads() and returns the final object, so
+callers always end with the same result the non-streaming path would have produced.
+"""
+import json
+
+_WHITESPACE = ' \t\r\n'
+
+def strip_fences(text):
+    return text.strip().replace('```json', '').replace('```', '').strip()
+
+class JSONObjectStream:
+    def __init__(self):
+        self.text = ''
+        self._pos = 0              # next character to scan
+        self._started = False      # saw the opening '{'
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = 'key'       # parser position at depth 1: key, colon, value, scalar, array or comma
+        self._string_start = None
+        self._key = None
+        self._value_start = None
+        self._item_start = None
+        self._item_index = 0
+        self._last_partial = None
+
+    def feed(self, chunk):
+        self.text += chunk
+        events = []
+        while self._pos < len(self.text):
+            self._step(self.text[self._pos], events)
+            self._pos += 1
+        partial = self._partial_string()
+        if partial is not None and partial != self._last_partial:
+            self._last_partial = partial
+            events.append(('partial', self._key, partial))
+        return events
+
+    def close(self):
+        return json.loads(strip_fences(self.text))
+
+    def _step(self, ch, events):
+        i = self._pos
+        if not self._started:
+            if ch == '{':
+                self._started, self._depth = True, 1
+            return
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == '\\':
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                self._close_string(i, events)
+            return
+        if ch == '"':
+            self._in_string = True
+            self._string_start = i
+            if self._depth == 1 and self._expect == 'value':
+                self._value_start = i
+            self._maybe_start_item(i)
+            return
+        if ch in _WHITESPACE: return
+
+        if self._depth == 1:
+            if self._expect == 'colon' and ch == ':':
+                self._expect = 'value'
+            elif self._expect == 'value':
+                self._value_start = i
+                self._expect = 'scalar'
+                if ch in '{[':
+                    self._depth += 1
+                    self._item_start, self._item_index = None, 0
+                    self._expect = 'comma' if ch == '{' else 'array'
+            elif self._expect == 'scalar' and ch in ',}':
+                self._emit_field(i, events)
+                self._expect = 'key'
+            elif self._expect == 'comma' and ch == ',':
+                self._expect = 'key'
+            if ch == '}' and self._expect in ('key', 'comma'):
+                self._depth = 0
+            return
+
+        # Inside a top-level array or object value
+        self._maybe_start_item(i)
+        if ch in '{[':
+            self._depth += 1
+        elif ch in '}]':
+            if self._depth == 2 and self._expect == 'array': self._emit_item(i, events)
+            self._depth -= 1
+            if self._depth == 1:
+                self._emit_field(i + 1, events)
+                self._expect = 'comma'
+        elif ch == ',' and self._depth == 2 and self._expect == 'array':
+            self._emit_item(i, events)
+
+    def _close_string(self, i, events):
+        if self._depth == 1 and self._expect == 'key':
+            self._key = json.loads(self.text[self._string_start:i + 1])
+            self._expect = 'colon'
+        elif self._depth == 1 and self._expect == 'value':
+            self._emit_field(i + 1, events)
+            self._expect = 'comma'
+            self._last_partial = None
+
+    def _maybe_start_item(self, i):
+        if self._depth == 2 and self._expect == 'array' and self._item_start is None:
+            self._item_start = i
+
+    def _emit_field(self, end, events):
+        try:
+            events.append(('field', self._key, json.loads(self.text[self._value_start:end])))
+        except ValueError:
+            pass  # malformed value; close() will report the error
+
+    def _emit_item(self, end, events):
+        if self._item_start is None: return
+        try:
+            events.append(('item', self._key, self._item_index, json.loads(self.text[self._item_start:end])))
+        except ValueError:
+            pass
+        self._item_start = None
+        self._item_index += 1
+
+    def _partial_string(self):
+        """Decoded text of a top-level string value that is still open, if any."""
+        if not (self._in_string and self._depth == 1 and self._expect == 'value'): return None
+        raw = self.text[self._string_start + 1:]
+        # A chunk can end inside an escape sequence (e.g. "\u00"); drop the unfinished tail
+        for trim in range(min(6, len(raw)) + 1):
+            try:
+                return json.loads(f'"{raw[:len(raw) - trim]}"')
+            except ValueError:
+                continue
+        return None
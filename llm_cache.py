@@ -0,0 +1,147 @@
+"""Content-addressed cache for model responses.
+
+Entries are keyed by a SHA-256 of the model name and the whitespace-normalized prompt,
+so the same prompt sent by any worker maps to the same entry. Lookups go through the
+tiers in order (in-process LRU first, then the shared database table) and a hit in a
+slower tier is copied into the faster ones. Tier failures are counted and treated as
+misses; the cache must never break the request that uses it.
+"""
+import hashlib
+import logging
+import re
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_prompt(prompt):
+    return _WHITESPACE.sub(' ', prompt).strip()
+
+def make_key(model_name, prompt):
+    return hashlib.sha256(f'{model_name}\n{normalize_prompt(prompt)}'.encode('utf-8')).hexdigest()
+
+
+class MemoryCacheTier(TTLCache):
+    """In-process tier. Values are (text, latency_seconds) pairs."""
+    name = 'memory'
+
+    def set(self, key, value, ttl, model_name=''):
+        super().set(key, value, ttl)
+
+
+class DatabaseCacheTier:
+    """Shared tier stored in `table` (see LLMCacheEntry in app.py).
+
+    Uses its own short transactions on the engine so cache traffic never commits or
+    rolls back the caller's session. Every `evict_every` writes it drops expired rows
+    and trims the table to `max_entries`, oldest first.
+    """
+    name = 'database'
+
+    def __init__(self, engine_getter, table, max_entries=50000, evict_every=200):
+        self._engine_getter = engine_getter
+        self.table = table
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        t = self.table
+        with self._engine_getter().connect() as conn:
+            row = conn.execute(
+                select(t.c.response_text, t.c.latency_ms).where(t.c.key == key, t.c.expires_at > datetime.utcnow())
+            ).first()
+        if row is None: return None
+        return row.response_text, (row.latency_ms or 0) / 1000
+
+    def set(self, key, value, ttl, model_name=''):
+        text, latency = value
+        t = self.table
+        now = datetime.utcnow()
+        with self._engine_getter().begin() as conn:
+            conn.execute(delete(t).where(t.c.key == key))
+            conn.execute(insert(t).values(
+                key=key, model_name=model_name, response_text=text,
+                latency_ms=int(latency * 1000), created_at=now, expires_at=now + timedelta(seconds=ttl)
+            ))
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due: self.evict()
+
+    def evict(self):
+        t = self.table
+        with self._engine_getter().begin() as conn:
+            removed = conn.execute(delete(t).where(t.c.expires_at <= datetime.utcnow())).rowcount or 0
+            overflow = conn.execute(select(func.count()).select_from(t)).scalar() - self.max_entries
+            if overflow > 0:
+                oldest = select(t.c.key).order_by(t.c.created_at).limit(overflow)
+                removed += conn.execute(delete(t).where(t.c.key.in_(oldest))).rowcount or 0
+        self.evictions += removed
+
+
+class LLMCache:
+    def __init__(self, tiers, ttl):
+        self.tiers = tiers
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.stats = {'hits': {tier.name: 0 for tier in tiers}, 'misses': 0, 'sets': 0, 'errors': 0, 'saved_seconds': 0.0}
+
+    def _count(self, field, tier=None, amount=1):
+        with self._lock:
+            if tier: self.stats[field][tier] += amount
+            else: self.stats[field] += amount
+
+    def get(self, key):
+        """Return the cached response text or None."""
+        for index, tier in enumerate(self.tiers):
+            try:
+                value = tier.get(key)
+            except Exception as e:
+                logger.warning('LLM cache %s tier read failed: %s', tier.name, e)
+                self._count('errors')
+                continue
+            if value is None: continue
+            self._count('hits', tier.name)
+            self._count('saved_seconds', amount=value[1])
+            for faster in self.tiers[:index]:
+                try:
+                    faster.set(key, value, self.ttl)
+                except Exception:
+                    self._count('errors')
+            return value[0]
+        self._count('misses')
+        return None
+
+    def set(self, key, text, latency=0.0, model_name=''):
+        """Store a response; `latency` is what the model call cost, reported as savings on later hits."""
+        self._count('sets')
+        for tier in self.tiers:
+            try:
+                tier.set(key, (text, latency), self.ttl, model_name=model_name)
+            except Exception as e:
+                logger.warning('LLM cache %s tier write failed: %s', tier.name, e)
+                self._count('errors')
+
+    def snapshot(self):
+        with self._lock:
+            stats = {
+                'hits': dict(self.stats['hits']),
+                'misses': self.stats['misses'],
+                'sets': self.stats['sets'],
+                'errors': self.stats['errors'],
+                'saved_seconds': round(self.stats['saved_seconds'], 2),
+            }
+        lookups = sum(stats['hits'].values()) + stats['misses']
+        stats['hit_ratio'] = round(sum(stats['hits'].values()) / lookups, 3) if lookups else None
+        stats['evictions'] = {tier.name: tier.evictions for tier in self.tiers}
+        stats['memory_entries'] = next((len(t) for t in self.tiers if isinstance(t, MemoryCacheTier)), 0)
+        return stats
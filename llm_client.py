@@ -0,0 +1,268 @@
+"""Structured JSON output from the model, parsed and validated in one place.
+
+Every prompt in the app asks for a JSON object. `LLMClient.generate(prompt, schema)` asks
+the model for JSON output constrained to `schema` and parses it tolerantly: code fences,
+text around the object and trailing commas are fixed locally. It then checks the result
+against the schema and returns a clean dict.
+
+Only malformed answers are retried. The malformed text and the parse or validation error
+go back to the model, which only has to correct its own output. That is faster than
+asking the original question again and throwing the first answer away. Errors raised by
+the model call itself are not retried here; they propagate to the caller as before.
+
+Schemas are plain dicts in the OpenAPI subset Gemini accepts as `response_schema`:
+"type" (object, array, string, integer, number, boolean), "properties", "required",
+"items", "enum" and "nullable". The same dict drives local validation, so a cached
+answer from an older prompt that no longer fits the schema is treated as a miss.
+
+An optional `observer` sees every model call and cache lookup, so app.py can record
+latency, token counts, errors and hit rates without this module knowing about metrics.
+
+An optional `governor` (llm_governor.Governor) decides when each call may start.
+generate() and stream() take the call's priority. A stream holds its slot until it has
+been read to the end or closed.
+"""
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+
+import json_stream
+import llm_cache
+from llm_governor import INTERACTIVE, PRIORITY_NAMES, is_rate_limited
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+class StructuredOutputError(ValueError):
+    """The model's answer could not be parsed or did not match the schema."""
+
+
+def parse_json(text):
+    """Parse a JSON object out of model text. Returns (value, repaired_locally)."""
+    cleaned = json_stream.strip_fences(text)
+    try:
+        return json.loads(cleaned), False
+    except ValueError as e:
+        error = e
+    start, end = cleaned.find('{'), cleaned.rfind('}')
+    if start != -1 and end > start:
+        try:
+            return json.loads(_TRAILING_COMMA.sub(r'\1', cleaned[start:end + 1])), True
+        except ValueError:
+            pass
+    raise StructuredOutputError(f'invalid JSON: {error}')
+
+def validate(value, schema, path='$'):
+    """Check `value` against `schema` and return it with harmless drift coerced
+    ("7" or 7.0 for an integer, "true" for a boolean). Raises StructuredOutputError."""
+    if value is None:
+        if schema.get('nullable'): return None
+        raise StructuredOutputError(f'{path} is missing')
+    kind = schema.get('type', 'object').lower()
+    if kind == 'object':
+        if not isinstance(value, dict): raise StructuredOutputError(f'{path} must be an object')
+        for key in schema.get('required', []):
+            if key not in value: raise StructuredOutputError(f'{path}.{key} is missing')
+        result = dict(value)
+        for key, subschema in schema.get('properties', {}).items():
+            if key in value: result[key] = validate(value[key], subschema, f'{path}.{key}')
+        return result
+    if kind == 'array':
+        if not isinstance(value, list): raise StructuredOutputError(f'{path} must be an array')
+        items = schema.get('items')
+        return [validate(v, items, f'{path}[{i}]') for i, v in enumerate(value)] if items else value
+    if kind == 'string':
+        if isinstance(value, (int, float)) and not isinstance(value, bool): value = str(value)
+        if not isinstance(value, str): raise StructuredOutputError(f'{path} must be a string')
+        if 'enum' in schema and value not in schema['enum']:
+            raise StructuredOutputError(f'{path} must be one of {schema["enum"]}')
+        return value
+    if kind == 'boolean':
+        if isinstance(value, str) and value.lower() in ('true', 'false'): return value.lower() == 'true'
+        if not isinstance(value, bool): raise StructuredOutputError(f'{path} must be a boolean')
+        return value
+    if kind in ('integer', 'number'):
+        if isinstance(value, str):
+            try:
+                value = float(value.strip())
+            except ValueError:
+                raise StructuredOutputError(f'{path} must be a number') from None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise StructuredOutputError(f'{path} must be a number')
+        if kind == 'integer':
+            if value != int(value): raise StructuredOutputError(f'{path} must be an integer')
+            return int(value)
+        return value
+    return value
+
+
+class LLMClient:
+    """JSON calls to `model_getter()` through `cache` (an llm_cache.LLMCache or None).
+
+    `json_mode` is 'schema' (JSON output constrained to the schema), 'json' (JSON output
+    only) or 'off' (rely on the prompt, for models without structured output support).
+    `observer`, if given, has record_call(operation, seconds, usage_metadata, error),
+    record_cache(hit) and record_wait(priority_name, seconds).
+    """
+
+    def __init__(self, model_getter, cache, model_name, json_mode='schema', max_repairs=1, observer=None,
+                 governor=None):
+        self._model_getter = model_getter
+        self.cache = cache
+        self.model_name = model_name
+        self.json_mode = json_mode
+        self.max_repairs = max_repairs
+        self.observer = observer
+        self.governor = governor
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'cache_hits': 0, 'malformed': 0, 'repaired_locally': 0,
+                      'repair_calls': 0, 'repaired': 0, 'failed': 0}
+
+    def _count(self, field, amount=1):
+        with self._lock:
+            self.stats[field] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, json_mode=self.json_mode)
+
+    def _generation_config(self, schema, constrain=True):
+        if self.json_mode == 'off': return None
+        config = {'response_mime_type': 'application/json'}
+        if constrain and self.json_mode == 'schema': config['response_schema'] = schema
+        return config
+
+    def _observe(self, operation, started, response=None, error=None):
+        if self.observer:
+            self.observer.record_call(operation, time.monotonic() - started,
+                                      getattr(response, 'usage_metadata', None), error)
+
+    def _admitted(self, seconds, priority):
+        if self.observer: self.observer.record_wait(PRIORITY_NAMES[priority], seconds)
+
+    def _call(self, prompt, schema, operation='generate', priority=INTERACTIVE, **kwargs):
+        """Model call. A streaming response is returned unconsumed, and stream() observes it
+        and holds its governor slot; other calls are admitted by the governor here."""
+        config = self._generation_config(schema, kwargs.pop('constrain', True))
+        if config: kwargs['generation_config'] = config
+
+        def attempt():
+            self._count('calls')
+            started = time.monotonic()
+            try:
+                response = self._model_getter().generate_content(prompt, **kwargs)
+            except Exception as e:
+                self._observe(operation, started, error=e)
+                raise
+            if not kwargs.get('stream'): self._observe(operation, started, response)
+            return response
+
+        if self.governor is None or kwargs.get('stream'): return attempt()
+        return self.governor.call(priority, attempt, on_wait=lambda seconds: self._admitted(seconds, priority))
+
+    def _cached(self, key, schema):
+        if self.cache is None: return None
+        text = self.cache.get(key)
+        result = None
+        if text is not None:
+            try:
+                result = validate(parse_json(text)[0], schema)
+            except StructuredOutputError:
+                pass  # written for an older prompt or schema; ask again
+        if result is not None: self._count('cache_hits')
+        if self.observer: self.observer.record_cache(result is not None)
+        return result
+
+    def _parse(self, text, schema):
+        value, repaired_locally = parse_json(text)
+        result = validate(value, schema)
+        if repaired_locally: self._count('repaired_locally')
+        return result
+
+    def _finish(self, prompt, schema, text, priority=INTERACTIVE):
+        """Parse `text`, asking the model to fix it up to max_repairs times.
+        Returns (result, text_that_parsed)."""
+        for attempt in range(self.max_repairs + 1):
+            try:
+                result = self._parse(text, schema)
+                if attempt: self._count('repaired')
+                return result, text
+            except StructuredOutputError as e:
+                self._count('malformed')
+                if attempt == self.max_repairs:
+                    self._count('failed')
+                    raise
+                logger.warning('Malformed model output (%s), asking for a correction', e)
+                self._count('repair_calls')
+                text = self._call(self._repair_prompt(prompt, text, e), schema, operation='repair', priority=priority).text
+
+    def _repair_prompt(self, prompt, text, error):
+        return f"""{prompt}
+
+Your previous reply could not be used: {error}.
+Previous reply:
+{text}
+
+Return only the corrected JSON object, with the same content where it was valid."""
+
+    def _store(self, key, text, started):
+        if self.cache is None: return
+        self.cache.set(key, json_stream.strip_fences(text), latency=time.monotonic() - started, model_name=self.model_name)
+
+    def generate(self, prompt, schema, cache=True, priority=INTERACTIVE):
+        """Return the validated answer to `prompt`, served from the cache when possible.
+        Only answers that validate are cached."""
+        key = llm_cache.make_key(self.model_name, prompt)
+        if cache:
+            cached = self._cached(key, schema)
+            if cached is not None: return cached
+
+        started = time.monotonic()
+        result, text = self._finish(prompt, schema, self._call(prompt, schema, priority=priority).text, priority)
+        if cache: self._store(key, text, started)
+        return result
+
+    def stream(self, prompt, schema, priority=INTERACTIVE):
+        """Streaming form of generate(). Yields json_stream events ('partial' / 'item' /
+        'field', ...) while the model is still writing, then ('done', result).
+
+        Streams request plain JSON output without the schema constraint, because
+        constrained output orders keys alphabetically and callers rely on the order the
+        prompt asks for (e.g. a score before its feedback). The result is still validated.
+        """
+        key = llm_cache.make_key(self.model_name, prompt)
+        parser = json_stream.JSONObjectStream()
+        cached = self._cached(key, schema)
+        if cached is not None:
+            yield from parser.feed(json.dumps(cached))
+            yield ('done', cached)
+            return
+
+        started = time.monotonic()
+        for attempt in itertools.count():
+            if self.governor: self._admitted(self.governor.acquire(priority), priority)
+            throttled = received = False
+            try:
+                response = self._call(prompt, schema, operation='stream', stream=True, constrain=False)
+                try:
+                    for chunk in response:
+                        received = True
+                        yield from parser.feed(chunk.text)
+                except Exception as e:
+                    self._observe('stream', started, error=e)
+                    raise
+                break
+            except Exception as e:
+                # A quota error before the first chunk is retried like any other call
+                throttled = is_rate_limited(e)
+                if received or not throttled or not self.governor or attempt >= self.governor.max_retries: raise
+            finally:
+                if self.governor: self.governor.release(throttled)
+        self._observe('stream', started, response)
+        result, text = self._finish(prompt, schema, parser.text, priority)
+        self._store(key, text, started)
+        yield ('done', result)
@@ -0,0 +1,156 @@
+"""Admission control for model calls: when each call may start, by priority.
+
+Every call carries a priority. INTERACTIVE is a candidate waiting in an interview,
+BACKGROUND is work someone is waiting on indirectly (final reports), and BATCH is a bulk
+admin job (shortlisting, question banks). A call starts once it has a concurrency slot
+and, if a requests-per-minute limit is set, a token from the bucket. Waiting calls are
+admitted strictly by priority, then in arrival order. `reserved` slots are only ever
+given to interactive calls, so a shortlist run can fill the rest but never all of them.
+
+A 429 / RESOURCE_EXHAUSTED error means the quota is spent. The governor then stops
+admitting calls for an exponentially growing, fully jittered pause, and halves its
+concurrency window. Each successful call grows the window back by about one slot per
+window's worth of calls, up to `max_concurrency`. The throttled call is retried once the
+pause is over, up to `max_retries` times.
+
+Waiting is bounded per priority (`max_wait`). A call that cannot start in time raises
+Overloaded instead of queueing behind a backlog it cannot beat, so an interview request
+fails fast with a retryable error instead of hanging.
+
+Limits apply per process. With several gunicorn workers, divide the project quota by
+the number of workers.
+"""
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+
+INTERACTIVE, BACKGROUND, BATCH = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background', BATCH: 'batch'}
+_QUOTA_ERROR = re.compile(r'\b429\b|RESOURCE_EXHAUSTED')
+
+class Overloaded(RuntimeError):
+    """A call waited longer than its priority allows for a slot."""
+
+
+def is_rate_limited(error):
+    """True for quota errors: HTTP 429, gRPC RESOURCE_EXHAUSTED (google.api_core's
+    ResourceExhausted carries code 429)."""
+    if getattr(error, 'code', None) == 429: return True
+    if type(error).__name__ in ('ResourceExhausted', 'TooManyRequests'): return True
+    return bool(_QUOTA_ERROR.search(str(error)))
+
+
+class Governor:
+    def __init__(self, max_concurrency=16, reserved=4, requests_per_minute=0, max_wait=None,
+                 max_retries=3, backoff_base=1.0, backoff_max=60.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.reserved = max(0, min(reserved, self.max_concurrency - 1))
+        self.rate = requests_per_minute / 60.0              # tokens per second; 0 = no rate limit
+        self.burst = max(1.0, min(self.rate * 10, self.max_concurrency)) if self.rate else 0
+        self.max_wait = {INTERACTIVE: 20.0, BACKGROUND: 300.0, BATCH: None}
+        self.max_wait.update(max_wait or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._cond = threading.Condition()
+        self._queue = []                  # heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._window = float(self.max_concurrency)
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._throttle_streak = 0
+        self.stats = {'admitted': 0, 'throttled': 0, 'overloaded': 0}
+
+    # --- Admission ---
+    def _limit(self, priority):
+        window = max(1, int(self._window))
+        return window if priority == INTERACTIVE else max(1, window - self.reserved)
+
+    def _refill(self, now):
+        if self.rate:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _delay(self, ticket, now):
+        """0 if `ticket` may start now, seconds to wait for a timed condition (pause, token),
+        or None to wait until something is released."""
+        if self._queue[0] != ticket: return None
+        if now < self._paused_until: return self._paused_until - now
+        if self._in_flight >= self._limit(ticket[0]): return None
+        self._refill(now)
+        if self.rate and self._tokens < 1: return (1 - self._tokens) / self.rate
+        return 0
+
+    def acquire(self, priority):
+        """Wait for permission to start a call. Returns the seconds spent waiting."""
+        started = time.monotonic()
+        limit = self.max_wait.get(priority)
+        deadline = started + limit if limit is not None else None
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._delay(ticket, now)
+                    if delay == 0: break
+                    if deadline is not None:
+                        if now >= deadline:
+                            self.stats['overloaded'] += 1
+                            raise Overloaded(f'no model capacity after {now - started:.1f}s '
+                                             f'({PRIORITY_NAMES[priority]} priority)')
+                        delay = deadline - now if delay is None else min(delay, deadline - now)
+                    self._cond.wait(delay)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self._in_flight += 1
+            if self.rate: self._tokens -= 1
+            self.stats['admitted'] += 1
+            self._cond.notify_all()   # the next waiter may be admissible too
+        return time.monotonic() - started
+
+    def release(self, throttled=False):
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self._throttle_streak += 1
+                self.stats['throttled'] += 1
+                pause = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (self._throttle_streak - 1)))
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                self._window = max(1.0, self._window / 2)
+            else:
+                self._throttle_streak = 0
+                self._window = min(float(self.max_concurrency), self._window + 1 / self._window)
+            self._cond.notify_all()
+
+    def call(self, priority, fn, on_wait=None):
+        """Run `fn()` once admitted, retrying after the pause when it is rate limited.
+        `on_wait(seconds)` is told how long each admission took."""
+        for attempt in itertools.count():
+            waited = self.acquire(priority)
+            if on_wait: on_wait(waited)
+            throttled = False
+            try:
+                return fn()
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                if not throttled or attempt >= self.max_retries: raise
+            finally:
+                self.release(throttled)
+
+    def snapshot(self):
+        with self._cond:
+            waiting = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue: waiting[PRIORITY_NAMES[priority]] += 1
+            return dict(self.stats, in_flight=self._in_flight, window=round(self._window, 2), waiting=waiting,
+                        paused_seconds=round(max(0.0, self._paused_until - time.monotonic()), 2))
@@ -0,0 +1,107 @@
+"""Ordered schema migrations applied on top of db.create_all().
+
+db.create_all() only creates tables that are missing; it never adds indexes or columns
+to tables that already exist. Every migration below is recorded in schema_migrations
+once it has run, so existing deployments converge on the schema the models declare.
+Statements are idempotent (IF NOT EXISTS) because fresh databases already get the
+declared indexes from create_all().
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant used for pg_advisory_xact_lock so concurrent workers migrate one at a time
+MIGRATION_LOCK_KEY = 724011
+
+APPLICATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_jobs_admin_id ON jobs (admin_id)",
+    "CREATE INDEX IF NOT EXISTS ix_applications_job_id_status ON applications (job_id, status)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_applications_candidate_job ON applications (candidate_id, job_id)",
+]
+
+def _check_duplicate_applications(conn):
+    """The unique (candidate_id, job_id) index cannot be built while duplicates exist.
+    They could only have been created by the old read-then-insert race in apply_to_job,
+    so refuse to continue and let an operator decide which rows to keep.
+    """
+    duplicates = conn.execute(text(
+        "SELECT candidate_id, job_id, COUNT(*) FROM applications "
+        "GROUP BY candidate_id, job_id HAVING COUNT(*) > 1"
+    )).fetchall()
+    if duplicates:
+        pairs = ', '.join(f'(candidate {c}, job {j}) x{n}' for c, j, n in duplicates[:20])
+        raise RuntimeError(
+            f"Cannot add unique (candidate_id, job_id) index: duplicate applications exist: {pairs}. "
+            "Remove the extra rows and restart to finish the migration."
+        )
+
+def _add_column(table, column, ddl):
+    """Migration step adding a column unless create_all() already built it."""
+    def step(conn):
+        if column not in {c['name'] for c in inspect(conn).get_columns(table)}:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return step
+
+def _postgres_only(statement):
+    """Migration step for DDL that SQLite cannot express (development databases skip it)."""
+    def step(conn):
+        if conn.dialect.name == 'postgresql': conn.execute(text(statement))
+    return step
+
+MIGRATIONS = [
+    (1, 'Index hot application and job lookups', [
+        _check_duplicate_applications,
+        *APPLICATION_INDEXES,
+        "CREATE INDEX IF NOT EXISTS ix_background_tasks_status_run_after ON background_tasks (status, run_after)",
+    ]),
+    (2, 'Reference deduplicated resumes from applications', [
+        _add_column('applications', 'resume_id', 'INTEGER REFERENCES resumes (id)'),
+        "CREATE INDEX IF NOT EXISTS ix_applications_resume_id ON applications (resume_id)",
+        _postgres_only("ALTER TABLE applications ALTER COLUMN resume_text DROP NOT NULL"),
+    ]),
+    (3, 'Atomic tab-switch counters on applications', [
+        _add_column('applications', 'tab_switch_count', 'INTEGER NOT NULL DEFAULT 0'),
+        _add_column('applications', 'last_tab_switch_at', 'TIMESTAMP'),
+    ]),
+    # Expressions must match search.tsvector() exactly for the planner to use these
+    (4, 'Full-text search indexes on jobs and resumes', [
+        _postgres_only("CREATE INDEX IF NOT EXISTS ix_jobs_search ON jobs USING GIN "
+                       "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')))"),
+        _postgres_only("CREATE INDEX IF NOT EXISTS ix_resumes_search ON resumes USING GIN "
+                       "(to_tsvector('english', coalesce(text, '')))"),
+        _postgres_only("CREATE INDEX IF NOT EXISTS ix_applications_resume_text_search ON applications USING GIN "
+                       "(to_tsvector('english', coalesce(resume_text, '')))"),
+    ]),
+    (5, 'Version counter for atomic interview session updates', [
+        _add_column('interview_sessions', 'version', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+]
+
+def run_migrations(engine):
+    """Apply pending migrations in a single transaction and return the versions applied."""
+    applied_now = []
+    with engine.begin() as conn:
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, description VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+        ))
+        applied = {row[0] for row in conn.execute(text('SELECT version FROM schema_migrations'))}
+        for version, description, steps in MIGRATIONS:
+            if version in applied: continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': version, 'd': description, 't': datetime.utcnow()}
+            )
+            logger.info('Applied migration %s: %s', version, description)
+            applied_now.append(version)
+    return applied_now
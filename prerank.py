@@ -0,0 +1,102 @@
+"""Local pre-ranking of resumes against a job description.
+
+Shortlisting sends each resume to the model. For a large applicant pool most of those
+calls go to resumes that share almost no vocabulary with the job. This module scores
+every resume locally with TF-IDF cosine similarity, so only the strongest matches need
+a model call.
+
+Texts are turned into hashed term-frequency vectors (no vocabulary to fit or store).
+The vectors are cached by content hash, so a resume shared by several applications, or
+a job description ranked again, is tokenized once. IDF weights come from the pool being
+ranked, so a term every applicant mentions counts for little. Ranking a pool is a
+handful of vectorized NumPy operations over the concatenated sparse vectors.
+"""
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or that the this to was
+    were will with we you your our their they i my me he she his her them who what which
+    all any can into more most other over such than then there these those very also not
+    no yes if but about up out so do does did done been being am
+""".split())
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class HashingVectorizer:
+    """Sparse sublinear term-frequency vectors over `n_features` hashed dimensions."""
+
+    def __init__(self, n_features=2 ** 18, cache_entries=20000):
+        self.n_features = n_features
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def vector(self, text):
+        """(indices, weights) for `text`: sorted unique feature ids and 1 + log(tf)."""
+        key = hashlib.sha1(text.encode('utf-8')).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        tokens = tokenize(text)
+        # crc32 rather than hash(): the same term must land on the same feature in every process
+        ids = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in tokens), dtype=np.int64, count=len(tokens))
+        indices, counts = np.unique(ids % self.n_features, return_counts=True)
+        entry = (indices, 1.0 + np.log(counts, dtype=np.float32))
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = entry
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return entry
+
+    def similarities(self, query, documents):
+        """Cosine similarity of each text in `documents` to `query`, TF-IDF weighted
+        with document frequencies taken from `documents`. Returns a float array."""
+        if not documents: return np.zeros(0, dtype=np.float32)
+        vectors = [self.vector(text or '') for text in documents]
+        lengths = np.fromiter((len(v[0]) for v in vectors), dtype=np.int64, count=len(vectors))
+        rows = np.repeat(np.arange(len(vectors)), lengths)
+        indices = np.concatenate([v[0] for v in vectors])
+        weights = np.concatenate([v[1] for v in vectors])
+
+        df = np.bincount(indices, minlength=self.n_features)
+        idf = (np.log((1.0 + len(vectors)) / (1.0 + df)) + 1.0).astype(np.float32)
+        weights = weights * idf[indices]
+
+        query_indices, query_weights = self.vector(query)
+        dense_query = np.zeros(self.n_features, dtype=np.float32)
+        dense_query[query_indices] = query_weights * idf[query_indices]
+        query_norm = np.linalg.norm(dense_query[query_indices])
+
+        dots = np.bincount(rows, weights * dense_query[indices], minlength=len(vectors))
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(vectors)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = dots / (norms * query_norm)
+        return np.nan_to_num(scores).astype(np.float32)
+
+
+def select(scores, top_k=0, min_score=0.0):
+    """Boolean mask of the scores that pass the cut. `top_k` keeps the k best, `min_score`
+    drops everything below it; either one at 0 does not filter, and with both set a
+    score must pass both."""
+    keep = np.ones(len(scores), dtype=bool)
+    if min_score > 0: keep &= scores >= min_score
+    if 0 < top_k < len(scores):
+        best = np.argsort(-scores, kind='stable')[:top_k]
+        in_top = np.zeros(len(scores), dtype=bool)
+        in_top[best] = True
+        keep &= in_top
+    return keep
@@ -0,0 +1,50 @@
+"""Process pools for CPU-bound work that must not run inside a web worker.
+
+Pools start lazily on first use. Where the platform has it, every pool forks its
+workers from one shared forkserver, so children neither inherit the web worker's
+threads and sockets nor re-import the Flask app. The forkserver is started once per
+process with a single preload list. So each WorkerPool registers its modules when it
+is created, and the list given to the forkserver is the union over all pools, whichever
+pool starts first.
+
+Modules that create a pool are imported by the forkserver on their own, so they must not
+import app.py.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_preload = []
+_preload_lock = threading.Lock()
+
+def _context():
+    try:
+        context = multiprocessing.get_context('forkserver')
+    except ValueError:
+        return multiprocessing.get_context()
+    with _preload_lock:
+        context.set_forkserver_preload(list(_preload))
+    return context
+
+
+class WorkerPool:
+    """A lazily started ProcessPoolExecutor whose workers have `preload` imported."""
+
+    def __init__(self, preload):
+        with _preload_lock:
+            _preload.extend(name for name in preload if name not in _preload)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self, max_workers):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=_context())
+        return self._pool
+
+    def reset(self):
+        """Drop a pool that broke (e.g. a worker was OOM-killed); the next get() starts a fresh one."""
+        with self._lock:
+            if self._pool is not None: self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,77 @@
+"""Write-behind buffer for proctoring events.
+
+Interviews report face, focus and tab-switch events continuously. Writing a row per event
+would put thousands of concurrent interviews' worth of single-row INSERTs on the
+database. Instead, requests append rows to an in-process buffer. A background thread
+then writes them with one multi-row INSERT every `interval` seconds, or sooner once
+`max_batch` rows are waiting.
+
+If a flush fails, its rows go back to the front of the buffer to be retried. At most
+`max_pending` rows are held. Past that the oldest rows are dropped and counted, so a
+database outage cannot exhaust memory. Call `flush()` directly before reading the events
+back, so the rows this process received are included.
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class EventBuffer:
+    def __init__(self, write_rows, max_batch=500, interval=1.0, max_pending=50000):
+        self._write_rows = write_rows
+        self.max_batch = max_batch
+        self.interval = interval
+        self.max_pending = max_pending
+        self._rows = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'received': 0, 'written': 0, 'flushes': 0, 'failed_flushes': 0, 'dropped': 0}
+
+    def add(self, rows):
+        with self._lock:
+            self._rows.extend(rows)
+            self.stats['received'] += len(rows)
+            self._trim()
+            pending = len(self._rows)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='proctor-event-flusher', daemon=True)
+                self._thread.start()
+        if pending >= self.max_batch: self._wake.set()
+
+    def _trim(self):
+        overflow = len(self._rows) - self.max_pending
+        if overflow > 0:
+            del self._rows[:overflow]
+            self.stats['dropped'] += overflow
+
+    def flush(self):
+        """Write everything buffered so far; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows: return 0
+            try:
+                self._write_rows(rows)
+            except Exception as e:
+                logger.warning('Proctoring event flush of %s rows failed: %s', len(rows), e)
+                with self._lock:
+                    self._rows[:0] = rows
+                    self.stats['failed_flushes'] += 1
+                    self._trim()
+                return 0
+            with self._lock:
+                self.stats['written'] += len(rows)
+                self.stats['flushes'] += 1
+            return len(rows)
+
+    def pending(self):
+        with self._lock:
+            return len(self._rows)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
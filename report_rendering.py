@@ -0,0 +1,80 @@
+"""PDF rendering for final interview reports, executed in a separate process pool.
+
+ReportLab layout is pure-Python CPU work that holds the GIL for the whole build, so a
+report rendered inside a web worker stalls every other request on that worker. The
+stylesheet is built once per process, so each long-lived pool worker pays for it
+once rather than per report, and the PDF is written straight to its destination file
+instead of being assembled in memory and copied.
+
+ReportLab is imported on first use rather than at module import, so web workers that
+import this module only to submit jobs never load it. The forkserver preloads it instead,
+and pool workers start with it already imported.
+"""
+import os
+import time
+
+import process_pools
+
+PAGE_MARGINS = {'leftMargin': 72, 'rightMargin': 72, 'topMargin': 72, 'bottomMargin': 72}
+
+def _build_styles():
+    from reportlab.lib.colors import navy, red
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='TitleStyle', fontName='Helvetica-Bold', fontSize=24, alignment=TA_CENTER, spaceAfter=20))
+    styles.add(ParagraphStyle(name='Heading1Style', fontName='Helvetica-Bold', fontSize=16, spaceBefore=12, spaceAfter=6, textColor=navy))
+    styles.add(ParagraphStyle(name='BulletStyle', leftIndent=20, spaceBefore=2))
+    styles.add(ParagraphStyle(name='WarningStyle', leftIndent=20, spaceBefore=2, textColor=red))
+    return styles
+
+_styles = None
+
+def get_styles():
+    global _styles
+    if _styles is None: _styles = _build_styles()
+    return _styles
+
+def build_story(scorecard, proctoring_flags):
+    from reportlab.platypus import HRFlowable, Paragraph, Spacer
+    styles = get_styles()
+    story = []
+    story.append(Paragraph("Candidate Performance Report", styles['TitleStyle']))
+    story.append(Paragraph("Overall Summary", styles['Heading1Style']))
+    story.append(Paragraph(scorecard.get('overall_summary', 'N/A'), styles['Normal']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Key Strengths", styles['Heading1Style']))
+    for s in scorecard.get('strengths', []): story.append(Paragraph(f"• {s}", styles['BulletStyle']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Areas for Improvement", styles['Heading1Style']))
+    for a in scorecard.get('areas_for_improvement', []): story.append(Paragraph(f"• {a}", styles['BulletStyle']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Final Recommendation", styles['Heading1Style']))
+    story.append(Paragraph(f"<b>{scorecard.get('final_recommendation', 'N/A')}</b>", styles['Normal']))
+
+    if proctoring_flags:
+        story.append(Spacer(1, 12)); story.append(HRFlowable(width="100%"))
+        story.append(Paragraph("Proctoring Flags", styles['Heading1Style']))
+        for flag in sorted(set(proctoring_flags)): story.append(Paragraph(f"• {flag}", styles['WarningStyle']))
+    return story
+
+def render_report(scorecard, proctoring_flags, path):
+    """Worker-process entry point: write the report PDF to `path`.
+
+    The document is built into a sibling temporary file and renamed into place, so a
+    reader never sees a half-written report. Returns {'bytes': ..., 'ms': ...}.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+    started = time.perf_counter()
+    partial_path = f'{path}.{os.getpid()}.partial'
+    try:
+        SimpleDocTemplate(partial_path, pagesize=letter, **PAGE_MARGINS).build(build_story(scorecard, proctoring_flags))
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path): os.remove(partial_path)
+    return {'bytes': os.path.getsize(path), 'ms': round((time.perf_counter() - started) * 1000, 1)}
+
+
+_pool = process_pools.WorkerPool(['reportlab.platypus', 'reportlab.lib.styles', __name__])
+get_pool, reset_pool = _pool.get, _pool.reset
@@ -0,0 +1,160 @@
+"""Storage backends for generated interview reports.
+
+Reports are addressed by a key (e.g. "report_application_12.pdf"). A backend renders
+into `staging_path(key)` and then publishes the file with `save(key, path)`. Reads go
+through `stat(key)` and `open(key)`, which returns a seekable binary file, so
+`send_report` can stream any backend in chunks with ETag, Last-Modified and Range
+support.
+
+LocalReportStorage keeps files in a directory. These files are lost when the
+filesystem is ephemeral, for example on a Render redeploy. DatabaseReportStorage keeps
+them in a table (see ReportBlob in app.py) and reads them back in slices. An object
+store backend only needs the same five methods.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import uuid
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from flask import request, send_file
+from sqlalchemy import delete, func, insert, select
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+
+ReportInfo = namedtuple('ReportInfo', ['size', 'etag', 'last_modified'])
+
+def report_key(application_id):
+    return f'report_application_{application_id}.pdf'
+
+
+class LocalReportStorage:
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, key):
+        # Older rows stored "reports/<file>"; only the file name is meaningful
+        return os.path.join(self.root, os.path.basename(key))
+
+    def staging_path(self, key):
+        # The renderer already writes through a temp file and renames it into place
+        return self.path(key)
+
+    def save(self, key, path):
+        if os.path.abspath(path) != self.path(key): os.replace(path, self.path(key))
+
+    def stat(self, key):
+        try:
+            st = os.stat(self.path(key))
+        except FileNotFoundError:
+            return None
+        return ReportInfo(st.st_size, f'{st.st_mtime_ns:x}-{st.st_size:x}',
+                          datetime.fromtimestamp(st.st_mtime, timezone.utc))
+
+    def open(self, key):
+        return open(self.path(key), 'rb')
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+class _BlobReader(io.RawIOBase):
+    """Seekable reader that fetches a stored blob one slice per read()."""
+
+    def __init__(self, engine, table, key, size):
+        self._engine = engine
+        self._table = table
+        self._key = key
+        self._size = size
+        self._position = 0
+
+    def readable(self): return True
+    def seekable(self): return True
+    def tell(self): return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def readinto(self, buffer):
+        length = min(len(buffer), self._size - self._position)
+        if length <= 0: return 0
+        t = self._table
+        with self._engine.connect() as conn:
+            chunk = conn.execute(
+                select(func.substr(t.c.content, self._position + 1, length)).where(t.c.key == self._key)
+            ).scalar()
+        chunk = bytes(chunk or b'')
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+class DatabaseReportStorage:
+    """Reports stored as blobs in `table`. Survives redeploys and works across instances."""
+    name = 'database'
+
+    def __init__(self, engine_getter, table, read_chunk_size=256 * 1024):
+        self._engine_getter = engine_getter
+        self.table = table
+        self.read_chunk_size = read_chunk_size
+
+    def staging_path(self, key):
+        return os.path.join(tempfile.gettempdir(), f'{uuid.uuid4().hex}-{key}')
+
+    def save(self, key, path):
+        with open(path, 'rb') as f: content = f.read()
+        t = self.table
+        with self._engine_getter().begin() as conn:
+            conn.execute(delete(t).where(t.c.key == key))
+            conn.execute(insert(t).values(
+                key=key, content=content, size=len(content),
+                etag=hashlib.sha256(content).hexdigest()[:32], created_at=datetime.utcnow()
+            ))
+        os.remove(path)
+
+    def stat(self, key):
+        t = self.table
+        with self._engine_getter().connect() as conn:
+            row = conn.execute(select(t.c.size, t.c.etag, t.c.created_at).where(t.c.key == key)).first()
+        if row is None: return None
+        return ReportInfo(row.size, row.etag, row.created_at.replace(tzinfo=timezone.utc))
+
+    def open(self, key):
+        info = self.stat(key)
+        if info is None: raise FileNotFoundError(key)
+        raw = _BlobReader(self._engine_getter(), self.table, key, info.size)
+        return io.BufferedReader(raw, buffer_size=self.read_chunk_size)
+
+    def delete(self, key):
+        with self._engine_getter().begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+
+def send_report(storage, key, download_name):
+    """Stream a stored report for the current request, or return None if it is missing.
+
+    Answers If-None-Match / If-Modified-Since with 304 and Range with 206. Reports are
+    private, so clients and proxies must revalidate instead of sharing cached copies.
+    """
+    info = storage.stat(key)
+    if info is None: return None
+    rv = send_file(
+        storage.open(key), mimetype='application/pdf', as_attachment=True, download_name=download_name,
+        conditional=False, etag=info.etag, last_modified=info.last_modified
+    )
+    rv.content_length = info.size
+    rv.cache_control.private = True
+    try:
+        return rv.make_conditional(request.environ, accept_ranges=True, complete_length=info.size)
+    except RequestedRangeNotSatisfiable:
+        rv.close()
+        raise
@@ -0,0 +1,80 @@
+"""Text extraction for uploaded PDF/DOCX files, executed in a separate process pool.
+
+Parsing is CPU-bound and PyPDF2 can spend a very long time on a single malformed or
+scanned page, so it runs outside the web worker. Each call gets a file path (the upload
+is streamed to a temporary file first), honours a page cap and a per-page timeout, and
+returns the text together with the stats needed for capacity planning.
+"""
+import signal
+import time
+
+import process_pools
+
+SUPPORTED_TYPES = ('pdf', 'docx')
+
+class ExtractionError(Exception):
+    pass
+
+class _PageTimeout(Exception):
+    pass
+
+def _raise_page_timeout(signum, frame):
+    raise _PageTimeout()
+
+def file_type(filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return extension if extension in SUPPORTED_TYPES else None
+
+def _extract_pdf(path, max_pages, page_timeout):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(path)
+    total = len(reader.pages)
+    parts, skipped = [], 0
+    use_alarm = page_timeout and hasattr(signal, 'setitimer')
+    previous = signal.signal(signal.SIGALRM, _raise_page_timeout) if use_alarm else None
+    try:
+        for index in range(min(total, max_pages)):
+            try:
+                if use_alarm: signal.setitimer(signal.ITIMER_REAL, page_timeout)
+                page_text = reader.pages[index].extract_text() or ""
+                if use_alarm: signal.setitimer(signal.ITIMER_REAL, 0)
+                parts.append(page_text)
+            except _PageTimeout:
+                skipped += 1
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return parts, min(total, max_pages), total, skipped
+
+def _extract_docx(path, max_paragraphs):
+    import docx
+    paragraphs = docx.Document(path).paragraphs
+    parts = [para.text + '\n' for para in paragraphs[:max_paragraphs]]
+    return parts, len(parts), len(paragraphs), 0
+
+def extract_file(path, kind, max_pages, page_timeout, size_bytes=None):
+    """Worker-process entry point. Returns {'text': ..., 'stats': {...}}."""
+    started = time.perf_counter()
+    if kind == 'pdf':
+        parts, pages, pages_total, skipped = _extract_pdf(path, max_pages, page_timeout)
+    elif kind == 'docx':
+        # DOCX has no pages; cap paragraphs at a generous multiple of the page cap instead
+        parts, pages, pages_total, skipped = _extract_docx(path, max_pages * 50)
+    else:
+        raise ExtractionError(f'Unsupported file type: {kind}')
+    return {
+        'text': ''.join(parts),
+        'stats': {
+            'pages': pages,
+            'pages_total': pages_total,
+            'pages_skipped': skipped,
+            'truncated': pages < pages_total,
+            'bytes': size_bytes,
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+    }
+
+
+_pool = process_pools.WorkerPool([__name__])
+get_pool, reset_pool = _pool.get, _pool.reset
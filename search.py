@@ -0,0 +1,58 @@
+"""Full-text search conditions for jobs and resumes.
+
+On PostgreSQL, text is matched with to_tsvector() @@ websearch_to_tsquery(), which
+accepts "quoted phrases", -exclusions and `or`, and is ranked with ts_rank_cd(). The
+GIN expression indexes from migration 4 serve these matches. The expression built by
+`tsvector()` has to stay identical to the indexed one, or the planner falls back to a
+sequential scan.
+
+Other databases (SQLite in development and test runs) use a fallback: every word of the
+query must appear in the text, case-insensitively, and the rank is the number of
+distinct words that matched.
+"""
+import re
+
+from sqlalchemy import and_, case, func, literal_column, true
+
+TEXT_SEARCH_CONFIG = 'english'
+_TERM = re.compile(r'[\w+#.]+')
+
+def document(*columns):
+    """`columns` joined into one text, NULLs as empty: coalesce(a, '') || ' ' || coalesce(b, '')."""
+    parts = [func.coalesce(column, literal_column("''")) for column in columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text.op('||')(literal_column("' '")).op('||')(part)
+    return text
+
+def tsvector(*columns):
+    return func.to_tsvector(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), document(*columns))
+
+def tsquery(query):
+    return func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), query)
+
+def terms(query):
+    return list(dict.fromkeys(t.strip('.') for t in _TERM.findall(query.lower()) if t.strip('.')))
+
+def _like_terms(query, columns):
+    text = func.lower(document(*columns))
+    escaped = (t.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') for t in terms(query))
+    return [text.like(f'%{t}%', escape='\\') for t in escaped]
+
+def matches(dialect, query, *columns):
+    """Condition: the text of `columns` matches the search `query`."""
+    if dialect == 'postgresql':
+        return tsvector(*columns).op('@@')(tsquery(query))
+    conditions = _like_terms(query, columns)
+    return and_(*conditions) if conditions else true()
+
+def rank(dialect, query, *columns):
+    """Relevance of the text of `columns` to `query`, higher is better."""
+    if dialect == 'postgresql':
+        return func.ts_rank_cd(tsvector(*columns), tsquery(query))
+    conditions = _like_terms(query, columns)
+    if not conditions: return literal_column('0')
+    total = case((conditions[0], 1), else_=0)
+    for condition in conditions[1:]:
+        total = total + case((condition, 1), else_=0)
+    return total
@@ -0,0 +1,77 @@
+"""In-process LRU map with per-entry expiry.
+
+The memory-backed caches and stores build on this one class: the LLM cache's memory
+tier (llm_cache.MemoryCacheTier), the public job listing cache in app.py and
+interview_sessions.MemorySessionStore. Values are opaque to it. `evictions` counts
+entries dropped for space or because they expired.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _live(self, key, now):
+        """The entry's value if present and unexpired; expired entries are dropped. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None: return None
+        value, expires_at = entry
+        if expires_at < now:
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        return value
+
+    def _store(self, key, value, ttl, now):
+        self._entries[key] = (value, now + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            value = self._live(key, time.monotonic())
+            if value is not None: self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._store(key, value, ttl, time.monotonic())
+
+    def modify(self, key, fn, ttl):
+        """Replace the value with fn(value) atomically and return it, or return None
+        without calling fn if the key is missing or expired."""
+        with self._lock:
+            now = time.monotonic()
+            value = self._live(key, now)
+            if value is None: return None
+            value = fn(value)
+            self._store(key, value, ttl, now)
+            return value
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+    def purge_expired(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at < now]
+            for key in expired: del self._entries[key]
+            self.evictions += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)